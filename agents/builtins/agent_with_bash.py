@@ -1,46 +1,68 @@
+import asyncio
 import os
 import shutil
-import subprocess
+import signal
 import tempfile
 
 from agents.core.agent_with_tools import AgentWithTools
 from agents.core.tools import tool
 
+COMMAND_TIMEOUT_SECONDS = 30
+
 
 class AgentWithBash(AgentWithTools):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.work_dir = tempfile.mkdtemp(prefix="agent_")
-        
+
     def __del__(self):
         if hasattr(self, 'work_dir') and os.path.exists(self.work_dir):
             shutil.rmtree(self.work_dir)
-    
+
     @tool
     async def execute_bash_command(self, command: str) -> str:
         """
         Execute a bash command and return the output.
         """
         try:
-            result = subprocess.run(
+            process = await asyncio.create_subprocess_shell(
                 command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=self.work_dir  # Execute in isolated directory
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.work_dir,  # Execute in isolated directory
+                start_new_session=True,  # Own process group, so the whole pipeline can be killed
             )
-            
-            output_parts = []
-            if result.stdout:
-                output_parts.append(f"STDOUT:\n{result.stdout}")
-            if result.stderr:
-                output_parts.append(f"STDERR:\n{result.stderr}")
-            if result.returncode != 0:
-                output_parts.append(f"Exit code: {result.returncode}")
-            
-            return "\n".join(output_parts) if output_parts else "Command executed successfully (no output)"
-        except subprocess.TimeoutExpired:
-            return "Error: Command timed out after 30 seconds"
         except Exception as e:
-            return f"Error executing command: {str(e)}"
\ No newline at end of file
+            return f"Error executing command: {str(e)}"
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=COMMAND_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            await _kill(process)
+            return f"Error: Command timed out after {COMMAND_TIMEOUT_SECONDS} seconds"
+        except asyncio.CancelledError:
+            # The turn was cancelled; don't leave the command running
+            await _kill(process)
+            raise
+        except Exception as e:
+            await _kill(process)
+            return f"Error executing command: {str(e)}"
+
+        output_parts = []
+        if stdout:
+            output_parts.append(f"STDOUT:\n{stdout.decode(errors='replace')}")
+        if stderr:
+            output_parts.append(f"STDERR:\n{stderr.decode(errors='replace')}")
+        if process.returncode != 0:
+            output_parts.append(f"Exit code: {process.returncode}")
+
+        return "\n".join(output_parts) if output_parts else "Command executed successfully (no output)"
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    await process.wait()
@@ -1,8 +1,20 @@
-from sqlalchemy import create_engine, text, inspect as sql_inspect
-from sqlalchemy.exc import SQLAlchemyError
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Callable, Dict, Iterable, Optional, Sequence, Tuple
 
+from sqlalchemy import Connection, CursorResult, Engine, Inspector, RootTransaction, Row, text, inspect as sql_inspect
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+
+from agents.builtins.schema_index import SchemaIndex, load_catalog
+from agents.builtins.sql_routing import DEFAULT_READ_YOUR_WRITES_SECONDS, EngineRouter, is_ddl_statement, is_read_only_statement
 from agents.core.agent_with_tools import AgentWithTools
-from agents.core.tools import tool
+from agents.core.cancellation import DEADLINE_EXCEEDED, CancellationToken, TurnCancelledError
+from agents.core.tool_cache import ToolCache
+from agents.core.tool_scheduler import ToolScheduler
+from agents.core.tools import CacheScope, ToolCacheOptions, ToolCall, ToolError, tool
 from llms.gemini.models import GeminiLLMModel
 from llms.gemini.llm import LLM
 
@@ -24,20 +36,288 @@ When executing SQL queries:
 - For SELECT queries, return the results in a clear, readable format
 - For DDL operations (CREATE, ALTER, DROP), confirm the operation was successful
 - If a query fails, provide a clear error message explaining what went wrong
+- To find the tables relevant to a question, use search_schema rather than
+  listing every table
 """
 
+# Catalog lookups are shared by every agent connected to the same database.
+# DDL issued through execute_query invalidates them; the TTL bounds staleness
+# from changes made by other clients.
+CATALOG_CACHE = ToolCacheOptions(ttl=300, scope=CacheScope.PROCESS)
+CATALOG_TOOLS = ("list_tables", "describe_table", "list_schemas")
+PASSTHROUGH_PREVIEW_ROWS = 5
+# Default deadline for a single statement; the scheduler cancels it on the backend
+QUERY_TIMEOUT_SECONDS = 60
+SCHEMA_SEARCH_TOP_K = 10
+
+# The tool call being executed, so a captured result can be tied to its place
+# in the model's issue order
+_current_tool_call: ContextVar[Optional[ToolCall]] = ContextVar("_current_tool_call", default=None)
+
+
+def _format_rows(columns, rows) -> str:
+    # Format results as a table
+    output_parts = []
+    # Header
+    header = " | ".join(str(col) for col in columns)
+    output_parts.append(header)
+    output_parts.append("-" * len(header))
+    # Rows
+    for row in rows:
+        row_str = " | ".join(
+            str(val) if val is not None else "NULL" for val in row
+        )
+        output_parts.append(row_str)
+
+    return "\n".join(output_parts)
+
+
+def _backend_canceller(connection: Connection) -> Optional[Callable[[], None]]:
+    # psycopg2 connections expose cancel(), sqlite3 connections interrupt()
+    dbapi_connection = connection.connection.dbapi_connection
+    return getattr(dbapi_connection, "cancel", None) or getattr(dbapi_connection, "interrupt", None)
+
+
+@contextmanager
+def _interruptible(connection: Connection, cancel_token: Optional[CancellationToken]):
+    """Ask the database to abort the running statement if the turn is cancelled."""
+    canceller = _backend_canceller(connection)
+    if cancel_token is None or canceller is None:
+        yield
+        return
+
+    # Runs in a worker thread, so only read the token's state here
+    if cancel_token.cancelled:
+        raise TurnCancelledError(cancel_token.reason or DEADLINE_EXCEEDED)
+    unregister = cancel_token.on_cancel(canceller)
+    try:
+        yield
+    finally:
+        unregister()
+
+
+async def _run_interruptible(
+    cancel_token: CancellationToken,
+    connection: Connection,
+    func: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    """
+    Run blocking work on `connection` in a thread. If the wait is cancelled, the
+    backend is interrupted and the thread is allowed to finish before
+    re-raising, so the connection is never used from two threads at once.
+    """
+    work = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await cancel_token.guard(asyncio.shield(work))
+    except BaseException:
+        if not work.done():
+            canceller = _backend_canceller(connection)
+            if canceller is not None:
+                canceller()
+            await asyncio.gather(work, return_exceptions=True)
+        raise
+
+
+async def _run_statement_in_thread(
+    func: Callable[..., Any],
+    *args: Any,
+    cancel_token: Optional[CancellationToken],
+) -> Any:
+    """
+    Run `func(*args, statement_token)` in a worker thread. If the awaiting task
+    is cancelled (the turn was cancelled or the tool call timed out), the
+    statement is cancelled on the backend through `statement_token` and the
+    thread is waited for before re-raising. The statement has then either
+    finished or rolled back, so nothing keeps running behind the caller's back.
+    A result the thread still produced is discarded, closing any cursor it holds.
+    """
+    statement_token = CancellationToken()
+    unlink = cancel_token.on_cancel(statement_token.cancel) if cancel_token is not None else (lambda: None)
+    work = asyncio.ensure_future(asyncio.to_thread(func, *args, statement_token))
+    try:
+        return await asyncio.shield(work)
+    except asyncio.CancelledError:
+        statement_token.cancel()
+        await asyncio.gather(work, return_exceptions=True)
+        if not work.cancelled() and work.exception() is None and isinstance(work.result(), PassthroughResult):
+            await work.result().aclose()
+        raise
+    finally:
+        unlink()
+
+
+class PassthroughResult:
+    """
+    The result of a query the model handed to the caller with return_rows.
+
+    The model only sees `preview()`. The caller reads every row with `arows`,
+    straight from the statement the model ran, so nothing is re-executed.
+    Results that fit in the preview are fully buffered; larger ones keep their
+    connection and server-side cursor open until they are read or closed.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        columns: Sequence[str],
+        rows: Sequence[Row],
+        connection: Optional[Connection] = None,
+        result: Optional[CursorResult] = None,
+    ) -> None:
+        self.query = query
+        self.columns = list(columns)
+        self._rows = list(rows)
+        self._connection = connection
+        self._result = result
+
+    def preview(self) -> str:
+        if not self._rows:
+            return "Query executed successfully. No rows returned."
+        preview = _format_rows(self.columns, self._rows[:PASSTHROUGH_PREVIEW_ROWS])
+        more = " (more rows not shown)" if len(self._rows) > PASSTHROUGH_PREVIEW_ROWS else ""
+        return (
+            f"Query executed successfully. Preview{more}:\n{preview}\n\n"
+            "The full result of this query will be delivered directly to the caller. "
+            "Do not repeat the rows in your reply."
+        )
+
+    async def arows(
+        self,
+        batch_size: int = 500,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Dict[str, Any]]:
+        """Yield every row as a dict, then close the result. Rows can only be read once."""
+        cancel_token = cancel_token or CancellationToken()
+        try:
+            rows, self._rows = self._rows, []
+            for row in rows:
+                yield dict(row._mapping)
+            if self._result is None:
+                return
+            while rows := await _run_interruptible(cancel_token, self._connection, self._result.fetchmany, batch_size):
+                for row in rows:
+                    yield dict(row._mapping)
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._connection is not None:
+            await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        connection, self._connection, self._result = self._connection, None, None
+        if connection is not None:
+            connection.close()
+
+
+async def _close_outcomes(outcomes: Iterable[str | PassthroughResult]) -> None:
+    for outcome in outcomes:
+        if isinstance(outcome, PassthroughResult):
+            await outcome.aclose()
+
 
 class AgentWithSQLTools(AgentWithTools):
-    def __init__(self, database_url: str) -> None:
+    def __init__(
+        self,
+        database_url: str,
+        replica_urls: str | Sequence[str] | None = None,
+        read_your_writes_seconds: Optional[float] = DEFAULT_READ_YOUR_WRITES_SECONDS,
+        turn_scoped_transactions: bool = False,
+        tool_scheduler: Optional[ToolScheduler] = None,
+    ) -> None:
+        """
+        With `turn_scoped_transactions`, a turn checks out one primary
+        connection and opens a transaction on first use. Its statements and
+        catalog lookups run on it, each inside its own savepoint. Only reads
+        issued before the turn's first write go to the replicas, when there
+        are any. The transaction is committed when the turn completes and
+        rolled back if it is cancelled or fails, so a multi-statement change
+        is atomic.
+
+        Pass a `tool_scheduler` to bound concurrency across tool calls or set a
+        deadline for every call; execute_query and return_rows default to
+        QUERY_TIMEOUT_SECONDS either way.
+        """
         llm = LLM(model=GeminiLLMModel.GEMINI_3_FLASH_PREVIEW)
         
-        super().__init__(llm=llm, instructions=INSTRUCTIONS)
+        super().__init__(llm=llm, instructions=INSTRUCTIONS, tool_scheduler=tool_scheduler)
         
         self.database_url = database_url
-        self.engine = create_engine(database_url)
+        self.router = EngineRouter(
+            primary_url=database_url,
+            replica_urls=replica_urls,
+            read_your_writes_seconds=read_your_writes_seconds,
+        )
+        self.engine = self.router.primary
+        # Catalog lookups always go to the primary so they reflect the latest DDL
         self.inspector = sql_inspect(self.engine)
 
-    @tool
+        self._passthrough = False
+        # return_rows outcomes by id of the tool call: a result, or the error the model saw
+        self._passthrough_results: Dict[int, Tuple[ToolCall, str | PassthroughResult]] = {}
+
+        # Built lazily on the first search and dropped on DDL
+        self._schema_index: Optional[SchemaIndex] = None
+        self._schema_index_built_at = 0.0
+        self._schema_index_lock = asyncio.Lock()
+
+        self.turn_scoped_transactions = turn_scoped_transactions
+        self._turn_connection: Optional[Connection] = None
+        self._turn_transaction: Optional[RootTransaction] = None
+        self._turn_ddl = False
+        self._in_turn = False
+        # Serializes use of the turn connection across worker threads
+        self._turn_lock = threading.Lock()
+
+    def dispose(self) -> None:
+        self.router.dispose()
+
+    def begin_result_passthrough(self) -> None:
+        """
+        Let the model hand the rows of a final query to the caller with
+        return_rows, instead of reading them itself. See `end_result_passthrough`.
+        """
+        self._passthrough = True
+        self._passthrough_results = {}
+
+    async def end_result_passthrough(self) -> Optional[PassthroughResult]:
+        """
+        Stop capturing and return the result of the last return_rows call the
+        model issued, if any. The other captured results are closed. Raises
+        ValueError if that last call failed, rather than falling back to an
+        earlier result.
+        """
+        captured, self._passthrough_results = self._passthrough_results, {}
+        self._passthrough = False
+
+        final: str | PassthroughResult | None = None
+        # Parallel reads finish in any order; the model's issue order decides which is last
+        for message in reversed(self._messages):
+            if not isinstance(message.content, list):
+                continue
+            issued = [tool_call for tool_call in message.content if id(tool_call) in captured]
+            for tool_call in reversed(message.content):
+                # Identical reads run once, so a later duplicate maps to the call that ran
+                match = next((c for c in issued if c.name == tool_call.name and c.args == tool_call.args), None)
+                if match is not None:
+                    final = captured.pop(id(match))[1]
+                    break
+            if issued:
+                break
+
+        await _close_outcomes(outcome for _, outcome in captured.values())
+        if isinstance(final, str):
+            raise ValueError(f"The final query failed: {final}")
+        return final
+
+    async def abort_result_passthrough(self) -> None:
+        """Stop capturing and close every captured result, e.g. after a failed turn."""
+        captured, self._passthrough_results = self._passthrough_results, {}
+        self._passthrough = False
+        await _close_outcomes(outcome for _, outcome in captured.values())
+
+    @tool(timeout=QUERY_TIMEOUT_SECONDS)
     async def execute_query(self, query: str) -> str:
         """
         Execute a SQL query against the database and return the results.
@@ -51,44 +331,247 @@ class AgentWithSQLTools(AgentWithTools):
             For other queries: A confirmation message with the number of rows
             affected
         """
-        try:
-            with self.engine.begin() as connection:
-                result = connection.execute(text(query))
-
-                # Check if this is a SELECT query (has rows to return)
-                if result.returns_rows:
-                    rows = result.fetchall()
-                    columns = result.keys()
-
-                    if not rows:
-                        return "Query executed successfully. No rows returned."
-
-                    # Format results as a table
-                    output_parts = []
-                    # Header
-                    header = " | ".join(str(col) for col in columns)
-                    output_parts.append(header)
-                    output_parts.append("-" * len(header))
-                    # Rows
-                    for row in rows:
-                        row_str = " | ".join(
-                            str(val) if val is not None else "NULL" for val in row
-                        )
-                        output_parts.append(row_str)
-
-                    return "\n".join(output_parts)
-                else:
-                    # For INSERT, UPDATE, DELETE, DDL operations
-                    # Transaction is automatically committed by 'begin()' context
-                    rowcount = result.rowcount
-                    return f"Query executed successfully. Rows affected: {rowcount}"
+        if not is_read_only_statement(query):
+            self.router.record_write()
 
+        try:
+            return await self._run_routed(query, capture=False)
         except SQLAlchemyError as e:
             return f"Error executing query: {str(e)}"
         except Exception as e:
             return f"Unexpected error: {str(e)}"
+        finally:
+            if is_ddl_statement(query):
+                if self._turn_connection is not None:
+                    self._turn_ddl = True
+                self._invalidate_catalog()
+
+    @tool(read_only=True, timeout=QUERY_TIMEOUT_SECONDS)
+    async def return_rows(self, query: str) -> str:
+        """
+        Run the final SELECT whose rows the caller asked for and deliver them
+        directly to the caller. You only see a short preview. Only use this
+        when the caller asks for rows to be returned; explore with execute_query.
+
+        Args:
+            query: A single read-only SELECT whose columns match the requested fields
 
-    @tool
+        Returns:
+            A preview of the rows delivered to the caller
+        """
+        if not self._passthrough:
+            return "Error: No caller is waiting for rows. Use execute_query instead."
+        if not is_read_only_statement(query):
+            return await self._capture_passthrough("Error: return_rows only accepts a single read-only query.")
+
+        try:
+            outcome = await self._run_routed(query, capture=True)
+        except SQLAlchemyError as e:
+            outcome = f"Error executing query: {str(e)}"
+        except Exception as e:
+            outcome = f"Unexpected error: {str(e)}"
+        return await self._capture_passthrough(outcome)
+
+    async def _run_routed(self, query: str, capture: bool) -> str | PassthroughResult:
+        if self._uses_turn_connection(query):
+            return await _run_statement_in_thread(self._execute_in_turn, query, capture, cancel_token=self._cancel_token)
+
+        engine = self.router.engine_for(query)
+        try:
+            return await _run_statement_in_thread(self._execute_on, engine, query, capture, cancel_token=self._cancel_token)
+        except DBAPIError as e:
+            # Only retry when the replica couldn't be reached. A statement that failed there
+            # (timeout, lock or recovery conflict) would cost the primary the same work.
+            if engine is self.engine or not e.connection_invalidated:
+                raise
+            # Read-only statements are safe to retry on the primary
+            return await _run_statement_in_thread(self._execute_on, self.engine, query, capture, cancel_token=self._cancel_token)
+
+    async def _execute_tool_call(self, tool_call: ToolCall) -> str:
+        token = _current_tool_call.set(tool_call)
+        try:
+            return await super()._execute_tool_call(tool_call)
+        finally:
+            _current_tool_call.reset(token)
+
+    async def _capture_passthrough(self, outcome: str | PassthroughResult) -> str:
+        response = outcome.preview() if isinstance(outcome, PassthroughResult) else outcome
+        tool_call = _current_tool_call.get()
+        if not self._passthrough or tool_call is None:
+            # Not run by the model during passthrough, so nobody will read the rows
+            await _close_outcomes([outcome])
+            return response
+
+        # Failures are recorded too: a failed final query must not fall back to an earlier result
+        self._passthrough_results[id(tool_call)] = (tool_call, outcome)
+        # Calls from earlier rounds are already in the history and can no longer be the final query
+        issued = {id(c) for message in self._messages if isinstance(message.content, list) for c in message.content}
+        stale = [self._passthrough_results.pop(key)[1] for key in list(self._passthrough_results) if key in issued]
+        await _close_outcomes(stale)
+        return response
+
+    async def _on_turn_start(self) -> None:
+        self._in_turn = True
+
+    async def _on_turn_end(self, completed: bool) -> None:
+        self._in_turn = False
+        if self._turn_connection is None:
+            return
+        try:
+            await asyncio.to_thread(self._finish_turn, completed)
+        finally:
+            if self._turn_ddl:
+                # DDL from the turn is now committed or rolled back either way
+                self._turn_ddl = False
+                self._invalidate_catalog()
+
+    def _uses_turn_connection(self, query: str) -> bool:
+        # Statements run outside astream have no turn to commit them
+        if not (self.turn_scoped_transactions and self._in_turn):
+            return False
+        # Reads before the turn's first write can still go to a replica
+        return self._turn_connection is not None or not is_read_only_statement(query) or not self.router.replicas
+
+    def _execute_in_turn(
+        self,
+        query: str,
+        capture: bool,
+        cancel_token: Optional[CancellationToken],
+    ) -> str | PassthroughResult:
+        with self._turn_lock:
+            connection = self._get_turn_connection()
+            # A savepoint per statement, so one failed statement doesn't abort the turn
+            with connection.begin_nested(), _interruptible(connection, cancel_token):
+                return self._run_statement(connection, query, capture)
+
+    def _get_turn_connection(self) -> Connection:
+        # Called with the turn lock held
+        if self._turn_connection is None:
+            self._turn_connection = self.engine.connect()
+            self._turn_transaction = self._turn_connection.begin()
+        return self._turn_connection
+
+    def _finish_turn(self, commit: bool) -> None:
+        # Waits for any statement still running on the turn connection
+        with self._turn_lock:
+            connection, transaction = self._turn_connection, self._turn_transaction
+            self._turn_connection = None
+            self._turn_transaction = None
+            try:
+                if commit:
+                    transaction.commit()
+                else:
+                    transaction.rollback()
+            finally:
+                connection.close()
+
+    async def _inspect(self, func: Callable[[Inspector], Any]) -> Any:
+        # Reflection is blocking I/O; keep it off the event loop like execute_query
+        return await asyncio.to_thread(self._inspect_in_thread, func)
+
+    def _inspect_in_thread(self, func: Callable[[Inspector], Any]) -> Any:
+        if not (self.turn_scoped_transactions and self._in_turn):
+            # One checkout for all of the call's round trips, rather than one each
+            with self.engine.connect() as connection:
+                return func(sql_inspect(connection))
+
+        # The turn connection also sees the turn's uncommitted DDL. The lock is
+        # taken and released within this thread, so a cancelled caller can't
+        # leave it held.
+        with self._turn_lock:
+            connection = self._get_turn_connection()
+            with connection.begin_nested():
+                return func(sql_inspect(connection))
+
+    def _tool_cache(self, tool_name: str) -> Optional[ToolCache]:
+        # Catalog responses that may include uncommitted DDL must not be shared
+        if tool_name in CATALOG_TOOLS and self._turn_ddl:
+            return None
+        return super()._tool_cache(tool_name)
+
+    def _invalidate_catalog(self) -> None:
+        self.inspector.clear_cache()
+        self._schema_index = None
+        for tool_name in CATALOG_TOOLS:
+            self.invalidate_tool_cache(tool_name)
+
+    async def _get_schema_index(self) -> SchemaIndex:
+        async with self._schema_index_lock:
+            # Same staleness bound as the cached catalog tools, for DDL made by other clients
+            if self._schema_index is None or time.monotonic() - self._schema_index_built_at > CATALOG_CACHE.ttl:
+                # Built on the turn connection when there is one, so it includes the turn's DDL.
+                # That DDL also drops the index again when the turn ends.
+                tables = await self._inspect(load_catalog)
+                self._schema_index = SchemaIndex(tables)
+                self._schema_index_built_at = time.monotonic()
+            return self._schema_index
+
+    def _tool_cache_namespace(self) -> str:
+        return self.database_url
+
+    def _is_read_only_tool_call(self, tool_call: ToolCall) -> bool:
+        if tool_call.name == "execute_query":
+            return is_read_only_statement((tool_call.args or {}).get("query", ""))
+        return super()._is_read_only_tool_call(tool_call)
+
+    def _execute_on(
+        self,
+        engine: Engine,
+        query: str,
+        capture: bool,
+        cancel_token: Optional[CancellationToken],
+    ) -> str | PassthroughResult:
+        if capture:
+            return self._open_passthrough(engine, query, cancel_token)
+        with engine.begin() as connection, _interruptible(connection, cancel_token):
+            return self._run_statement(connection, query)
+
+    def _open_passthrough(
+        self,
+        engine: Engine,
+        query: str,
+        cancel_token: Optional[CancellationToken],
+    ) -> str | PassthroughResult:
+        # Fetch only the preview; the rest stays on a server-side cursor for the caller
+        connection = engine.connect()
+        held = False
+        try:
+            with _interruptible(connection, cancel_token):
+                connection.execution_options(stream_results=True)
+                result = connection.execute(text(query))
+                if not result.returns_rows:
+                    return f"Query executed successfully. Rows affected: {result.rowcount}"
+                columns = result.keys()
+                rows = result.fetchmany(PASSTHROUGH_PREVIEW_ROWS + 1)
+            if len(rows) <= PASSTHROUGH_PREVIEW_ROWS:
+                return PassthroughResult(query, columns, rows)
+            held = True
+            return PassthroughResult(query, columns, rows, connection, result)
+        finally:
+            if not held:
+                connection.close()
+
+    def _run_statement(self, connection: Connection, query: str, capture: bool = False) -> str | PassthroughResult:
+        result = connection.execute(text(query))
+
+        # Check if this is a SELECT query (has rows to return)
+        if result.returns_rows:
+            columns = result.keys()
+            rows = result.fetchall()
+            if capture:
+                # The turn connection is shared, so the caller gets buffered rows
+                return PassthroughResult(query, columns, rows)
+            if not rows:
+                return "Query executed successfully. No rows returned."
+
+            return _format_rows(columns, rows)
+        else:
+            # For INSERT, UPDATE, DELETE, DDL operations
+            # The caller's transaction commits (or the turn does, in turn-scoped mode)
+            rowcount = result.rowcount
+            return f"Query executed successfully. Rows affected: {rowcount}"
+
+    @tool(read_only=True, cache=CATALOG_CACHE)
     async def list_tables(self) -> str:
         """
         List all tables in the database.
@@ -97,36 +580,50 @@ class AgentWithSQLTools(AgentWithTools):
             A formatted string listing all table names in the database
         """
         try:
-            tables = self.inspector.get_table_names()
+            tables = await self._inspect(lambda inspector: inspector.get_table_names())
             if not tables:
                 return "No tables found in the database."
             return "Tables in database:\n" + "\n".join(
                 f"  - {table}" for table in tables
             )
         except Exception as e:
-            return f"Error listing tables: {str(e)}"
+            raise ToolError(f"Error listing tables: {str(e)}") from e
 
-    @tool
-    async def describe_table(self, table_name: str) -> str:
+    @tool(read_only=True, cache=CATALOG_CACHE)
+    async def describe_table(self, table_name: str, schema_name: str = "") -> str:
         """
         Get detailed schema information about a specific table.
 
         Args:
             table_name: The name of the table to describe
+            schema_name: The schema the table is in, if not the default one (e.g. "logistics"
+                for logistics.shipping_addresses)
 
         Returns:
             A formatted string with column names, types, and constraints
         """
         try:
-            if not self.inspector.has_table(table_name):
-                return f"Table '{table_name}' does not exist in the database."
+            def reflect(inspector: Inspector):
+                name, schema = table_name, schema_name or None
+                if schema is None and "." in name and not inspector.has_table(name):
+                    # Also accept the schema.table names search_schema shows
+                    schema, name = name.split(".", 1)
+                if not inspector.has_table(name, schema=schema):
+                    return None
+                return (
+                    inspector.get_columns(name, schema=schema),
+                    inspector.get_pk_constraint(name, schema=schema)["constrained_columns"],
+                    inspector.get_foreign_keys(name, schema=schema),
+                    inspector.get_indexes(name, schema=schema),
+                )
 
-            columns = self.inspector.get_columns(table_name)
-            primary_keys = self.inspector.get_primary_keys(table_name)
-            foreign_keys = self.inspector.get_foreign_keys(table_name)
-            indexes = self.inspector.get_indexes(table_name)
+            qualified_name = f"{schema_name}.{table_name}" if schema_name else table_name
+            reflected = await self._inspect(reflect)
+            if reflected is None:
+                return f"Table '{qualified_name}' does not exist in the database."
+            columns, primary_keys, foreign_keys, indexes = reflected
 
-            output_parts = [f"Schema for table '{table_name}':\n"]
+            output_parts = [f"Schema for table '{qualified_name}':\n"]
 
             # Columns
             output_parts.append("Columns:")
@@ -165,9 +662,9 @@ class AgentWithSQLTools(AgentWithTools):
 
             return "\n".join(output_parts)
         except Exception as e:
-            return f"Error describing table: {str(e)}"
+            raise ToolError(f"Error describing table: {str(e)}") from e
 
-    @tool
+    @tool(read_only=True, cache=CATALOG_CACHE)
     async def list_schemas(self) -> str:
         """
         List all schemas in the database.
@@ -176,11 +673,47 @@ class AgentWithSQLTools(AgentWithTools):
             A formatted string listing all schema names
         """
         try:
-            schemas = self.inspector.get_schema_names()
+            schemas = await self._inspect(lambda inspector: inspector.get_schema_names())
             if not schemas:
                 return "No schemas found in the database."
             return "Schemas in database:\n" + "\n".join(
                 f"  - {schema}" for schema in schemas
             )
         except Exception as e:
-            return f"Error listing schemas: {str(e)}"
+            raise ToolError(f"Error listing schemas: {str(e)}") from e
+
+    @tool(read_only=True)
+    async def search_schema(self, query: str) -> str:
+        """
+        Search the database catalog for the tables most relevant to a question.
+        Matches table names, column names and comments across all schemas, so
+        it works on databases with thousands of tables.
+
+        Args:
+            query: Keywords describing the data you need (e.g. "customer orders shipping address")
+
+        Returns:
+            The best matching tables, each with its columns and types. Tables
+            outside the default schema are shown as schema.table
+        """
+        try:
+            index = await self._get_schema_index()
+            matches = index.search(query, top_k=SCHEMA_SEARCH_TOP_K)
+            if not matches:
+                return f"No tables match '{query}'."
+
+            output_parts = []
+            for table in matches:
+                header = table.qualified_name
+                if table.comment:
+                    header += f" -- {table.comment}"
+                output_parts.append(header)
+                for col in table.columns:
+                    col_info = f"  - {col.name}: {col.type}"
+                    if col.comment:
+                        col_info += f" -- {col.comment}"
+                    output_parts.append(col_info)
+
+            return "\n".join(output_parts)
+        except Exception as e:
+            raise ToolError(f"Error searching schema: {str(e)}") from e
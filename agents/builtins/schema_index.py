@@ -0,0 +1,132 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Inspector
+
+# Schemas that hold the database's own catalog rather than user data
+SYSTEM_SCHEMAS = {"information_schema", "pg_catalog", "pg_toast"}
+
+# Table-name matches count more than column or comment matches
+_TABLE_NAME_WEIGHT = 3
+
+_WORDS = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+class ColumnEntry(BaseModel):
+    name: str
+    type: str
+    comment: Optional[str] = None
+
+
+class TableEntry(BaseModel):
+    schema_name: Optional[str] = None
+    name: str
+    comment: Optional[str] = None
+    columns: List[ColumnEntry]
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.schema_name}.{self.name}" if self.schema_name else self.name
+
+
+def tokenize(text: str) -> List[str]:
+    """Split identifiers and prose into lowercase terms (snake_case and camelCase aware)."""
+    return [_singular(word.lower()) for word in _WORDS.findall(text or "")]
+
+
+def _singular(word: str) -> str:
+    # Crude plural folding so "users" matches "user" and "addresses" matches "address"
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+class SchemaIndex:
+    """
+    BM25 index over table names, column names and comments.
+    """
+
+    def __init__(self, tables: List[TableEntry], k1: float = 1.2, b: float = 0.75) -> None:
+        self.tables = tables
+        self._k1 = k1
+        self._b = b
+        self._term_freqs: List[Counter] = []
+        self._doc_freqs: Counter = Counter()
+
+        for table in tables:
+            terms = tokenize(table.name) * _TABLE_NAME_WEIGHT
+            terms += tokenize(table.schema_name or "") + tokenize(table.comment or "")
+            for column in table.columns:
+                terms += tokenize(column.name) + tokenize(column.comment or "")
+            term_freqs = Counter(terms)
+            self._term_freqs.append(term_freqs)
+            self._doc_freqs.update(term_freqs.keys())
+
+        self._doc_lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = sum(self._doc_lengths) / len(self._doc_lengths) if self._doc_lengths else 0.0
+
+    def search(self, query: str, top_k: int = 10) -> List[TableEntry]:
+        terms = set(tokenize(query))
+        if not terms or not self.tables:
+            return []
+
+        n = len(self.tables)
+        scored: List[Tuple[float, int]] = []
+        for i, term_freqs in enumerate(self._term_freqs):
+            score = 0.0
+            norm = self._k1 * (1 - self._b + self._b * self._doc_lengths[i] / (self._avg_length or 1.0))
+            for term in terms:
+                tf = term_freqs.get(term)
+                if not tf:
+                    continue
+                df = self._doc_freqs[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                score += idf * tf * (self._k1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((score, i))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [self.tables[i] for _, i in scored[:top_k]]
+
+
+def load_catalog(inspector: Inspector) -> List[TableEntry]:
+    """
+    Read every user table with its columns and comments, one schema at a time,
+    using the inspector's bulk reflection methods.
+    """
+    default_schema = inspector.default_schema_name
+    tables: List[TableEntry] = []
+
+    for schema in inspector.get_schema_names():
+        if schema in SYSTEM_SCHEMAS:
+            continue
+
+        columns_by_table = inspector.get_multi_columns(schema=schema)
+        try:
+            comments_by_table: Dict = inspector.get_multi_table_comment(schema=schema)
+        except NotImplementedError:
+            comments_by_table = {}
+
+        for key, columns in columns_by_table.items():
+            _, table_name = key
+            comment = (comments_by_table.get(key) or {}).get("text")
+            tables.append(TableEntry(
+                schema_name=None if schema == default_schema else schema,
+                name=table_name,
+                comment=comment,
+                columns=[
+                    ColumnEntry(name=col["name"], type=str(col["type"]), comment=col.get("comment"))
+                    for col in columns
+                ],
+            ))
+
+    return tables
@@ -0,0 +1,118 @@
+import itertools
+import re
+import time
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Engine, create_engine, event
+
+# Comments, string literals and quoted identifiers are blanked out before
+# classification so that keywords inside them don't affect routing.
+_NON_CODE = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"", re.DOTALL)
+_READ_ONLY_PREFIX = re.compile(r"^\s*(SELECT|WITH|SHOW|EXPLAIN|VALUES|TABLE)\b", re.IGNORECASE)
+_WRITE_MARKERS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|INTO|NEXTVAL|SETVAL|FOR\s+(NO\s+KEY\s+UPDATE|KEY\s+SHARE|SHARE))\b",
+    re.IGNORECASE,
+)
+_DDL = re.compile(r"(^|;)\s*(CREATE|ALTER|DROP|TRUNCATE|RENAME|COMMENT)\b", re.IGNORECASE)
+
+# Comfortably above typical replication lag, so a session sees its own writes
+# without pinning long-lived agents to the primary
+DEFAULT_READ_YOUR_WRITES_SECONDS = 5.0
+
+
+def is_ddl_statement(query: str) -> bool:
+    """Return True if any statement in the query changes the catalog."""
+    return _DDL.search(_NON_CODE.sub(" ", query)) is not None
+
+
+def is_read_only_statement(query: str) -> bool:
+    """
+    Return True if the statement is safe to run on a read replica.
+
+    The check is conservative: anything that is not a single SELECT-like
+    statement free of data-modifying clauses (writable CTEs, SELECT INTO,
+    row locks, sequence bumps) is treated as a write.
+    """
+    code = _NON_CODE.sub(" ", query).strip().rstrip(";")
+    if ";" in code:
+        return False
+    if not _READ_ONLY_PREFIX.match(code):
+        return False
+    return _WRITE_MARKERS.search(code) is None
+
+
+class EngineRouter:
+    """
+    Routes statements between a primary engine and an optional pool of read replicas.
+
+    Read-only statements are spread round-robin across the replicas; writes and
+    DDL always go to the primary. Once a write has been routed, reads stick to
+    the primary so the session can see its own writes, until
+    `read_your_writes_seconds` pass without a further write. Pass None to keep
+    them on the primary for the rest of the session.
+    """
+
+    def __init__(
+        self,
+        primary_url: str,
+        replica_urls: str | Sequence[str] | None = None,
+        read_your_writes_seconds: Optional[float] = DEFAULT_READ_YOUR_WRITES_SECONDS,
+    ) -> None:
+        if isinstance(replica_urls, str):
+            replica_urls = [replica_urls]
+
+        self.primary: Engine = _create_engine(primary_url)
+        self.replicas: List[Engine] = [_create_engine(url) for url in replica_urls or []]
+        self._replica_cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._last_write_at: Optional[float] = None
+
+    def engine_for(self, query: str) -> Engine:
+        if self._replica_cycle is None or self._pinned_to_primary() or not is_read_only_statement(query):
+            return self.primary
+        return next(self._replica_cycle)
+
+    def record_write(self) -> None:
+        self._last_write_at = time.monotonic()
+
+    def dispose(self) -> None:
+        self.primary.dispose()
+        for replica in self.replicas:
+            replica.dispose()
+
+    def _pinned_to_primary(self) -> bool:
+        if self._last_write_at is None:
+            return False
+        if self._read_your_writes_seconds is None:
+            return True
+        return time.monotonic() - self._last_write_at < self._read_your_writes_seconds
+
+
+def _create_engine(url: str) -> Engine:
+    engine = create_engine(url)
+    event.listen(engine, "handle_error", _flag_connect_failures)
+    if engine.dialect.driver == "pysqlite":
+        _use_sqlalchemy_transactions(engine)
+    return engine
+
+
+def _flag_connect_failures(context) -> None:
+    # Dialects only flag dropped connections as disconnects. Flag failed connects
+    # too, so `connection_invalidated` tells "unreachable" apart from "statement failed".
+    if context.connection is None:
+        context.is_disconnect = True
+
+
+def _use_sqlalchemy_transactions(engine: Engine) -> None:
+    """
+    pysqlite doesn't emit BEGIN when SQLAlchemy starts a transaction, so every
+    RELEASE SAVEPOINT commits and turn-scoped transactions aren't atomic. Hand
+    transaction control to SQLAlchemy, as its pysqlite documentation describes.
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
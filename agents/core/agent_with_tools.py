@@ -1,44 +1,119 @@
-from typing import AsyncGenerator, List
+from typing import Any, AsyncGenerator, Dict, List, Optional
 import asyncio
 import inspect
+import json
 
-from pydantic import create_model
+from pydantic import ValidationError, create_model
+from agents.core.cancellation import CALLER_CANCELLED, CancellationToken
 from agents.core.chat_context import ChatMessage, ChatRole
-from agents.core.tools import Tool, ToolCall
+from agents.core.tool_cache import CacheStats, ToolCache, get_process_cache
+from agents.core.tool_scheduler import ToolScheduler
+from agents.core.tools import CacheScope, Tool, ToolCall, ToolError, ToolOptions
 from llms.llm import LLM
 
 _IS_TOOL = "is_tool"
+_TOOL_OPTIONS = "tool_options"
 
 
 class AgentWithTools:
-    def __init__(self, llm: LLM, instructions: str,) -> None:
+    def __init__(self, llm: LLM, instructions: str, tool_scheduler: Optional[ToolScheduler] = None) -> None:
         self._llm = llm
         self._messages: List[ChatMessage] = [ChatMessage(role=ChatRole.SYSTEM, content=instructions)]
         self._tools = self._get_tools_from_decorated_methods()
+        self._tool_options = {t.name: t.options for t in self._tools}
+        self._tool_input_schemas = {t.name: t.input_schema for t in self._tools}
+        self._session_tool_caches: Dict[str, ToolCache] = {}
+        self._tool_scheduler = tool_scheduler or ToolScheduler()
+        # Token of the turn in progress, for tools that need to interrupt external work
+        self._cancel_token: Optional[CancellationToken] = None
 
-    async def astream(self, chat_message: ChatMessage) -> AsyncGenerator[str | ToolCall]:
+    async def astream(
+        self,
+        chat_message: ChatMessage,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[str | ToolCall]:
+        """
+        Run one turn. If `cancel_token` is cancelled or its deadline passes, the
+        provider stream is closed, in-flight tool calls are cancelled and
+        TurnCancelledError is raised. Cancelling the task consuming this
+        generator has the same effect. Messages are only added to the history
+        once complete, so after a cancel it holds the rounds that finished and
+        no partial response or tool calls without results. If no round
+        finished, the request is dropped from the history; otherwise a note
+        marks it as interrupted, so a later turn doesn't resume it unasked.
+        """
+        cancel_token = cancel_token or CancellationToken()
+        self._cancel_token = cancel_token
+        turn_start = len(self._messages)
+        completed = False
+        await self._on_turn_start()
+        try:
+            async for chunk in self._astream_round(chat_message, cancel_token):
+                yield chunk
+            completed = True
+        except asyncio.CancelledError:
+            # Fire registered cancellers (database statements, etc.) before unwinding
+            cancel_token.cancel(CALLER_CANCELLED)
+            raise
+        finally:
+            try:
+                if not completed:
+                    self._close_interrupted_turn(turn_start, cancel_token)
+                await self._on_turn_end(completed)
+            finally:
+                self._cancel_token = None
+
+    def _close_interrupted_turn(self, turn_start: int, cancel_token: CancellationToken) -> None:
+        # Only the request itself was added
+        if len(self._messages) <= turn_start + 1:
+            del self._messages[turn_start:]
+            return
+        reason = cancel_token.reason or "stopped"
+        self._messages.append(ChatMessage(
+            role=ChatRole.ASSISTANT,
+            content=f"[Interrupted ({reason}) before the request above was completed. Only the steps shown were done.]",
+        ))
+
+    async def _on_turn_start(self) -> None:
+        """Hook called before a turn starts. Subclasses can acquire turn-scoped resources here."""
+
+    async def _on_turn_end(self, completed: bool) -> None:
+        """
+        Hook called once a turn finishes. `completed` is False if the turn was
+        cancelled, failed, or its stream was closed before the end.
+        """
+
+    async def _astream_round(self, chat_message: ChatMessage, cancel_token: CancellationToken) -> AsyncGenerator[str | ToolCall]:
         self._messages.append(chat_message)
         response = ""
         tool_calls: List[ToolCall] = []
 
-        stream = self._llm.astream(messages=self._messages, tools=self._tools)
-        async for chunk in stream:
-            if isinstance(chunk, ToolCall):
-                tool_calls.append(chunk)
-            else:
-                response += chunk
-                yield chunk
+        stream = self._llm.astream(messages=self._messages, tools=self._tools, cancel_token=cancel_token)
+        try:
+            async for chunk in stream:
+                if isinstance(chunk, ToolCall):
+                    tool_calls.append(chunk)
+                else:
+                    response += chunk
+                    yield chunk
+        finally:
+            await stream.aclose()
 
         if response:
             self._messages.append(ChatMessage(role=ChatRole.ASSISTANT, content=response))
 
         if tool_calls:
-            tc_responses = await asyncio.gather(*[self._execute_tool_call(tool_call=tc) for tc in tool_calls])
+            tc_responses = await cancel_token.guard(self._tool_scheduler.run(
+                tool_calls,
+                execute=self._execute_tool_call,
+                options=self._tool_options,
+                is_read_only=self._is_read_only_tool_call,
+            ))
             for tool_call, tc_response in zip(tool_calls, tc_responses):
                 tool_call.response = tc_response
                 yield tool_call
             tool_calls_message = ChatMessage(role=ChatRole.ASSISTANT, content=tool_calls)
-            async for chunk_after_tool_calls in self.astream(tool_calls_message):
+            async for chunk_after_tool_calls in self._astream_round(tool_calls_message, cancel_token):
                 yield chunk_after_tool_calls
 
     async def _execute_tool_call(self, tool_call: ToolCall) -> str:
@@ -48,8 +123,78 @@ class AgentWithTools:
             raise ValueError(f"Method '{method_name}' not found on {self.__class__.__name__}")
 
         args = tool_call.args if tool_call.args is not None else {}
-        result = await method(**args)
-        return str(result)
+
+        cache = self._tool_cache(method_name)
+        cache_key = self._tool_cache_key(method_name, args) if cache is not None else None
+        if cache_key is not None:
+            hit, cached = cache.get(cache_key)
+            if hit:
+                return cached
+
+        try:
+            result = str(await method(**args))
+        except ToolError as e:
+            return str(e)
+        if cache_key is not None:
+            cache.set(cache_key, result)
+        return result
+
+    def invalidate_tool_cache(self, tool_name: Optional[str] = None, args: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Drop memoized tool responses: for every cached tool, for one tool, or
+        for one tool called with specific arguments.
+        """
+        names = [tool_name] if tool_name is not None else list(self._tool_options)
+        for name in names:
+            cache = self._tool_cache(name)
+            if cache is None:
+                continue
+            if args is None:
+                cache.invalidate()
+            elif (key := self._tool_cache_key(name, args)) is not None:
+                cache.invalidate(key)
+
+    def tool_cache_stats(self) -> Dict[str, CacheStats]:
+        return {name: cache.stats() for name in self._tool_options if (cache := self._tool_cache(name)) is not None}
+
+    def _tool_cache_namespace(self) -> str:
+        """
+        Process-scoped caches are shared by agents with the same namespace.
+        Override this when tool responses depend on instance state.
+        """
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
+    def _tool_cache(self, tool_name: str) -> Optional[ToolCache]:
+        options = self._tool_options.get(tool_name)
+        if options is None or options.cache is None:
+            return None
+
+        cache_options = options.cache
+        if cache_options.scope == CacheScope.PROCESS:
+            return get_process_cache(
+                namespace=self._tool_cache_namespace(),
+                tool_name=tool_name,
+                max_entries=cache_options.max_entries,
+                ttl=cache_options.ttl,
+            )
+        if tool_name not in self._session_tool_caches:
+            self._session_tool_caches[tool_name] = ToolCache(max_entries=cache_options.max_entries, ttl=cache_options.ttl)
+        return self._session_tool_caches[tool_name]
+
+    def _tool_cache_key(self, tool_name: str, args: Dict[str, Any]) -> Optional[str]:
+        try:
+            validated = self._tool_input_schemas[tool_name].model_validate(args)
+        except ValidationError:
+            # Let the tool itself report bad arguments; don't cache the outcome
+            return None
+        return json.dumps(validated.model_dump(mode="json"), sort_keys=True)
+
+    def _is_read_only_tool_call(self, tool_call: ToolCall) -> bool:
+        """
+        Whether the call can run in parallel with other reads. Subclasses can
+        override this for tools whose access mode depends on their arguments.
+        """
+        return self._tool_options.get(tool_call.name, ToolOptions()).read_only
 
     def _get_tools_from_decorated_methods(self) -> List[Tool]:
         tools = []
@@ -57,11 +202,15 @@ class AgentWithTools:
             attr = getattr(self, attr_name)
             if hasattr(attr, _IS_TOOL):
                 sig = inspect.signature(attr)
-                fields = {name: (param.annotation, ...) for name, param in sig.parameters.items() if name != "self"}
+                fields = {
+                    name: (param.annotation, ... if param.default is inspect.Parameter.empty else param.default)
+                    for name, param in sig.parameters.items() if name != "self"
+                }
                 input_schema = create_model(f"{attr.__name__}Input", **fields) if fields else create_model(f"{attr.__name__}Input")
                 tools.append(Tool(
                     name=attr.__name__,
                     description=attr.__doc__ or "",
                     input_schema=input_schema,
+                    options=getattr(attr, _TOOL_OPTIONS, None) or ToolOptions(),
                 ))
         return tools
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+CALLER_CANCELLED = "cancelled by caller"
+DEADLINE_EXCEEDED = "deadline exceeded"
+
+
+class TurnCancelledError(Exception):
+    pass
+
+
+class CancellationToken:
+    """
+    Deadline and cancellation signal for one agent turn.
+
+    The agent races LLM streaming and tool execution against the token, and
+    resources that can't be interrupted by task cancellation alone (database
+    statements running in worker threads, for example) register callbacks
+    with `on_cancel`. Callbacks run once, when the token is cancelled
+    explicitly or when a guarded await finds the deadline has passed.
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self._deadline = time.monotonic() + timeout if timeout is not None else None
+        self._event = asyncio.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        # on_cancel may be called from worker threads
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None or self._expired()
+
+    def remaining(self) -> Optional[float]:
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def cancel(self, reason: str = CALLER_CANCELLED) -> None:
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Best effort: one failing canceller must not stop the others
+                pass
+        self._event.set()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback to run on cancellation. Returns a function that unregisters it."""
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def check(self) -> None:
+        if self._expired():
+            self.cancel(DEADLINE_EXCEEDED)
+        if self.reason is not None:
+            raise TurnCancelledError(self.reason)
+
+    async def guard(self, aw: Awaitable[T]) -> T:
+        """
+        Await `aw`, or cancel it and raise TurnCancelledError if the token is
+        cancelled or the deadline passes first.
+        """
+        task = asyncio.ensure_future(aw)
+        try:
+            self.check()
+            waiter = asyncio.ensure_future(self._event.wait())
+            try:
+                await asyncio.wait({task, waiter}, timeout=self.remaining(), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            if task.done():
+                return task.result()
+            self.check()
+            # Deadline hit exactly at the boundary; treat it as exceeded
+            self.cancel(DEADLINE_EXCEEDED)
+            raise TurnCancelledError(self.reason)
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def iterate(self, aiterable: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Iterate `aiterable`, guarding every step."""
+        iterator = aiterable.__aiter__()
+        while True:
+            try:
+                item = await self.guard(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+
+    def _expired(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class ToolCache:
+    """
+    LRU cache of tool responses keyed by validated arguments, with an optional TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._stats = CacheStats()
+        # Process-scoped caches can be shared by agents running in different threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl is not None and time.monotonic() - entry[0] > self._ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._stats.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return True, entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._stats.model_copy(update={"size": len(self._entries)})
+
+
+# Caches shared by every agent in the process, keyed by (namespace, tool name)
+_PROCESS_CACHES: Dict[Tuple[str, str], ToolCache] = {}
+_PROCESS_CACHES_LOCK = threading.Lock()
+
+
+def get_process_cache(namespace: str, tool_name: str, max_entries: int, ttl: Optional[float]) -> ToolCache:
+    with _PROCESS_CACHES_LOCK:
+        key = (namespace, tool_name)
+        if key not in _PROCESS_CACHES:
+            _PROCESS_CACHES[key] = ToolCache(max_entries=max_entries, ttl=ttl)
+        return _PROCESS_CACHES[key]
@@ -0,0 +1,118 @@
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from agents.core.tools import ToolCall, ToolOptions
+
+
+class ToolScheduler:
+    """
+    Runs the tool calls of a single model round.
+
+    Calls are executed in the order the model issued them, with a barrier at
+    every write: consecutive read-only calls run in parallel (identical ones
+    are executed once and share the response), while each write runs on its
+    own after everything before it has finished. Per-tool and global
+    concurrency limits apply across rounds, and every call gets an optional
+    deadline. Cancelling the round cancels whatever is still in flight.
+
+    A timed-out call is cancelled and waited for before the round moves on.
+    Tools that hand work to threads or external processes are expected to
+    stop that work when cancelled (see the SQL and bash tools), so a timed-out
+    write can't overlap with the next one.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, default_timeout: Optional[float] = None) -> None:
+        self._global_limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._default_timeout = default_timeout
+        self._tool_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(
+        self,
+        tool_calls: List[ToolCall],
+        execute: Callable[[ToolCall], Awaitable[str]],
+        options: Dict[str, ToolOptions],
+        is_read_only: Callable[[ToolCall], bool],
+    ) -> List[str]:
+        responses: List[str] = [""] * len(tool_calls)
+        reads: List[int] = []
+
+        for i, tool_call in enumerate(tool_calls):
+            if is_read_only(tool_call):
+                reads.append(i)
+                continue
+            await self._run_reads(reads, tool_calls, responses, execute, options)
+            reads = []
+            [responses[i]] = await self._gather([self._run_one(tool_call, execute, options, read_only=False)])
+        await self._run_reads(reads, tool_calls, responses, execute, options)
+
+        return responses
+
+    async def _run_reads(
+        self,
+        indices: List[int],
+        tool_calls: List[ToolCall],
+        responses: List[str],
+        execute: Callable[[ToolCall], Awaitable[str]],
+        options: Dict[str, ToolOptions],
+    ) -> None:
+        if not indices:
+            return
+
+        # Identical read calls within the batch are executed once
+        unique: Dict[str, List[int]] = {}
+        for i in indices:
+            unique.setdefault(_call_key(tool_calls[i]), []).append(i)
+
+        groups = list(unique.values())
+        results = await self._gather([
+            self._run_one(tool_calls[group[0]], execute, options, read_only=True) for group in groups
+        ])
+        for group, result in zip(groups, results):
+            for i in group:
+                responses[i] = result
+
+    async def _run_one(
+        self,
+        tool_call: ToolCall,
+        execute: Callable[[ToolCall], Awaitable[str]],
+        options: Dict[str, ToolOptions],
+        read_only: bool,
+    ) -> str:
+        tool_options = options.get(tool_call.name, ToolOptions())
+        timeout = tool_options.timeout if tool_options.timeout is not None else self._default_timeout
+
+        async with AsyncExitStack() as stack:
+            if self._global_limit is not None:
+                await stack.enter_async_context(self._global_limit)
+            if tool_options.max_concurrency:
+                limit = self._tool_limits.setdefault(tool_call.name, asyncio.Semaphore(tool_options.max_concurrency))
+                await stack.enter_async_context(limit)
+
+            try:
+                async with asyncio.timeout(timeout):
+                    return await execute(tool_call)
+            except TimeoutError:
+                if read_only:
+                    return f"Error: Tool call '{tool_call.name}' timed out after {timeout} seconds"
+                # The write was cancelled, but it may have completed before the cancel took effect
+                return (
+                    f"Tool call '{tool_call.name}' timed out after {timeout} seconds and was cancelled. "
+                    "It may or may not have taken effect; check the current state before retrying."
+                )
+
+    async def _gather(self, coros: List[Awaitable[str]]) -> List[str]:
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # If any call failed or the round was cancelled, don't leave siblings running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _call_key(tool_call: ToolCall) -> str:
+    return json.dumps([tool_call.name, tool_call.args or {}], sort_keys=True, default=str)
@@ -1,11 +1,32 @@
+from enum import Enum
 from typing import Any, Dict, Optional, Type
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class CacheScope(Enum):
+    SESSION = "SESSION"
+    PROCESS = "PROCESS"
+
+
+class ToolCacheOptions(BaseModel):
+    ttl: Optional[float] = None
+    max_entries: int = 128
+    scope: CacheScope = CacheScope.SESSION
+
+
+class ToolOptions(BaseModel):
+    # Read-only tools may run in parallel; everything else is serialized
+    read_only: bool = False
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+    cache: Optional[ToolCacheOptions] = None
 
 
 class Tool(BaseModel):
     name: str
     description: str
     input_schema: Type[BaseModel]
+    options: ToolOptions = Field(default_factory=ToolOptions)
 
 
 class ToolCall(BaseModel):
@@ -16,9 +37,42 @@ class ToolCall(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
-def tool(func):
-    func.is_tool = True
-    return func
+class ToolError(Exception):
+    """
+    Raised by a tool to report a failure to the model. The message becomes the
+    tool's response, and memoized tools never cache it.
+    """
+
+
+def tool(
+    func=None,
+    *,
+    read_only: bool = False,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    cache: bool | ToolCacheOptions = False,
+):
+    """
+    Mark a method as a tool. Usable bare (`@tool`) or with scheduling options
+    (`@tool(read_only=True, max_concurrency=2, timeout=10)`).
+
+    Pass `cache=True` (or a `ToolCacheOptions`) to memoize responses of an
+    idempotent tool, keyed by its validated arguments.
+    """
+    if cache is True:
+        cache = ToolCacheOptions()
+
+    def decorate(f):
+        f.is_tool = True
+        f.tool_options = ToolOptions(
+            read_only=read_only,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            cache=cache or None,
+        )
+        return f
+
+    return decorate(func) if func is not None else decorate
 
 
 # class User(BaseModel):
@@ -1,10 +1,13 @@
 import asyncio
 from agents.builtins.agent_with_sql_tools import AgentWithSQLTools, INSTRUCTIONS
+from agents.core.cancellation import CancellationToken, TurnCancelledError
 from agents.core.chat_context import ChatMessage, ChatRole
 from agents.core.tools import ToolCall
 from llms.gemini.models import GeminiLLMModel
 from llms.gemini.llm import LLM as GeminiLLM
 
+TURN_TIMEOUT_SECONDS = 120
+
 
 async def run():
     llm = GeminiLLM(model=GeminiLLMModel.GEMINI_3_FLASH_PREVIEW)
@@ -26,18 +29,22 @@ async def run():
             print("Agent: ", end="", flush=True)
             assistant_content_parts: list[str] = []
             tool_calls: list[ToolCall] = []
-            async for chunk in agent.astream(chat_message=message):
-                if isinstance(chunk, ToolCall):
-                    tool_calls.append(chunk)
-                    print(f"Tool call: {chunk}")
-                else:
-                    print(chunk, end="", flush=True)
-                    assistant_content_parts.append(chunk)
+            cancel_token = CancellationToken(timeout=TURN_TIMEOUT_SECONDS)
+            try:
+                async for chunk in agent.astream(chat_message=message, cancel_token=cancel_token):
+                    if isinstance(chunk, ToolCall):
+                        tool_calls.append(chunk)
+                        print(f"Tool call: {chunk}")
+                    else:
+                        print(chunk, end="", flush=True)
+                        assistant_content_parts.append(chunk)
+            except TurnCancelledError as e:
+                print(f"\n[Turn cancelled: {e}]", end="")
             print()
     finally:
         # Close database connections
-        if hasattr(agent, 'engine'):
-            agent.engine.dispose()
+        if hasattr(agent, 'dispose'):
+            agent.dispose()
 
 
 if __name__ == "__main__":
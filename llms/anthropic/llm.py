@@ -1,9 +1,10 @@
 import json
 import os
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, List, Optional
 
 from anthropic import AsyncAnthropic, types
 
+from agents.core.cancellation import CancellationToken
 from agents.core.chat_context import ChatMessage
 from agents.core.tools import Tool, ToolCall
 from llms.anthropic.utils import chat_messages_to_anthropic_system_and_messages, tool_to_anthropic_tool
@@ -23,21 +24,30 @@ class LLM(BaseLLM):
         self,
         messages: list[ChatMessage],
         tools: List[Tool],
+        cancel_token: Optional[CancellationToken] = None,
     ) -> AsyncGenerator[str | ToolCall]:
+        cancel_token = cancel_token or CancellationToken()
         system, messages = chat_messages_to_anthropic_system_and_messages(messages)
-        stream = await self.client.messages.create(
+        stream = await cancel_token.guard(self.client.messages.create(
             max_tokens=1024,
             system=system,
             messages=messages,
             model=self.model,
             stream=True,
             tools=[tool_to_anthropic_tool(t) for t in tools]
-        )
+        ))
+        try:
+            async for chunk in self._aparse(stream, cancel_token):
+                yield chunk
+        finally:
+            # Closes the HTTP response if the turn was cancelled mid-stream
+            await stream.close()
 
+    async def _aparse(self, stream, cancel_token: CancellationToken) -> AsyncGenerator[str | ToolCall]:
         current_tool_call: ToolCall | None = None
         current_tool_args: str = ""
 
-        async for chunk in stream:
+        async for chunk in cancel_token.iterate(stream):
             if isinstance(chunk, types.RawContentBlockStartEvent):
                 content_block = chunk.content_block
                 if isinstance(content_block, types.ToolUseBlock):
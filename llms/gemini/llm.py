@@ -1,9 +1,10 @@
 import os
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, List, Optional
 
 from google import genai
 from google.genai import types
 
+from agents.core.cancellation import CancellationToken
 from agents.core.chat_context import ChatMessage
 from agents.core.tools import Tool, ToolCall
 from llms.gemini.utils import chat_messages_to_gemini_system_and_contents, tool_to_gemini_function_declaration
@@ -26,7 +27,9 @@ class LLM(BaseLLM):
         self,
         messages: list[ChatMessage],
         tools: List[Tool],
+        cancel_token: Optional[CancellationToken] = None,
     ) -> AsyncGenerator[str | ToolCall]:
+        cancel_token = cancel_token or CancellationToken()
         system_prompt, contents = chat_messages_to_gemini_system_and_contents(messages)
 
         # Prepare tools configuration
@@ -40,16 +43,23 @@ class LLM(BaseLLM):
         )
 
         # Use async streaming
-        stream = await self.client.aio.models.generate_content_stream(
+        stream = await cancel_token.guard(self.client.aio.models.generate_content_stream(
             model=self.model,
             contents=contents,
             config=config,
-        )
-
+        ))
+        try:
+            async for chunk in self._aparse(stream, cancel_token):
+                yield chunk
+        finally:
+            # Closes the HTTP response if the turn was cancelled mid-stream
+            await stream.aclose()
+
+    async def _aparse(self, stream, cancel_token: CancellationToken) -> AsyncGenerator[str | ToolCall]:
         current_tool_calls = []
         has_text_content = False
 
-        async for chunk in stream:
+        async for chunk in cancel_token.iterate(stream):
             # Check if this chunk has any parts
             if not chunk.candidates or not chunk.candidates[0].content.parts:
                 continue
@@ -1,7 +1,8 @@
 # Abstract base class for LLMs
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, List, Optional
 
+from agents.core.cancellation import CancellationToken
 from agents.core.chat_context import ChatMessage
 from agents.core.tools import Tool, ToolCall
 
@@ -12,5 +13,11 @@ class LLM(ABC):
         self,
         messages: list[ChatMessage],
         tools: List[Tool],
+        cancel_token: Optional[CancellationToken] = None,
     ) -> AsyncGenerator[str | ToolCall]:
+        """
+        Stream the model's response. When `cancel_token` is cancelled or its
+        deadline passes, implementations must close the provider stream and
+        raise TurnCancelledError.
+        """
         ...
@@ -1,17 +1,93 @@
+import json
+from typing import AsyncGenerator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
 from agents.builtins.agent_with_sql_tools import AgentWithSQLTools
+from agents.core.cancellation import CancellationToken
 from agents.core.chat_context import ChatMessage, ChatRole
 from agents.core.tools import ToolCall
 
+T = TypeVar("T", bound=BaseModel)
+
+TYPED_RESULT_INSTRUCTIONS = """
+The caller wants rows back as `{name}` objects with this JSON schema:
+
+{schema}
+
+Explore with execute_query as needed, then run the final SELECT with return_rows
+so its rows are returned directly to the caller. Its column names must match the
+fields above (use aliases where needed). Do not repeat the rows in your reply;
+answer with "Done".
+"""
+
 
 class Client:
     def __init__(self, database_url: str) -> None:
         self.db_url = database_url
         self._agent = AgentWithSQLTools(database_url=database_url)
 
-    async def execute(self, query: str) -> str:
+    async def execute(
+        self,
+        query: str,
+        result_type: Optional[Type[T]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> str | List[T]:
+        """
+        Run `query` through the agent. Pass a `CancellationToken` (e.g.
+        `CancellationToken(timeout=30)`) to bound or abort the call; the agent
+        then stops the model, its tools and any running statement.
+        """
+        if result_type is not None:
+            return [row async for row in self.stream(query, result_type, cancel_token=cancel_token)]
+
         response = ""
-        async for chunk in self._agent.astream(chat_message=ChatMessage(role=ChatRole.USER, content=query)):
+        message = ChatMessage(role=ChatRole.USER, content=query)
+        async for chunk in self._agent.astream(chat_message=message, cancel_token=cancel_token):
             if isinstance(chunk, ToolCall):
                 continue
             response += chunk
         return response
+
+    async def stream(
+        self,
+        query: str,
+        result_type: Type[T],
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[T]:
+        """
+        Let the agent plan the SQL for `query`, then stream the rows of its final
+        SELECT straight from the database as `result_type` objects. The model
+        only sees a preview of the rows, so it never has to re-type the result.
+
+        The rows come from the very statement the model ran with return_rows
+        (the last one it issued), not a re-execution, so they match the preview
+        it saw. Its other queries return full results to the model as usual.
+        Raises ValueError if the model did not return rows or its last
+        return_rows call failed.
+        """
+        instructions = TYPED_RESULT_INSTRUCTIONS.format(
+            name=result_type.__name__,
+            schema=json.dumps(result_type.model_json_schema(), indent=2),
+        )
+        message = ChatMessage(role=ChatRole.USER, content=f"{query}\n{instructions}")
+        cancel_token = cancel_token or CancellationToken()
+
+        self._agent.begin_result_passthrough()
+        try:
+            async for _ in self._agent.astream(chat_message=message, cancel_token=cancel_token):
+                pass
+        except BaseException:
+            await self._agent.abort_result_passthrough()
+            raise
+        final = await self._agent.end_result_passthrough()
+
+        if final is None:
+            raise ValueError(f"The agent did not run a query returning {result_type.__name__} rows")
+
+        try:
+            async for row in final.arows(cancel_token=cancel_token):
+                yield result_type.model_validate(row)
+        finally:
+            # Also closes the cursor if the caller stops early or validation fails
+            await final.aclose()
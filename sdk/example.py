@@ -1,9 +1,17 @@
+from pydantic import BaseModel
+
 from sdk.client import Client
 
 
 DB_URL = "postgresql://localhost/alcatraz"
 
 
+class User(BaseModel):
+    first_name: str
+    last_name: str
+    phone_number: str | None = None
+
+
 async def run():
     # 1. Instantiate the client and send some data
     client = Client(database_url=DB_URL)
@@ -21,8 +29,9 @@ async def run():
     colors = await client_2.execute("Get all colors of shoes.")
     print("Colors: ", colors)
 
-    # # 3. Query and cast the data
-    # client.execute("Get all users who've signed up in the past day", User)
+    # 3. Query and cast the data; rows come straight from the database as User objects
+    typed_users = await client_2.execute("Get all users who've signed up in the past day", User)
+    print("Typed users: ", typed_users)
 
 
 if __name__ == "__main__":
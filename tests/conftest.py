@@ -0,0 +1,86 @@
+import asyncio
+from typing import List
+
+import pytest
+from sqlalchemy import create_engine
+
+from agents.core.cancellation import CancellationToken
+from agents.core.tools import ToolCall
+from llms.llm import LLM
+
+# A round item that blocks until the turn is cancelled
+HANG = object()
+
+
+class ScriptedLLM(LLM):
+    """Replays one scripted round per call. Exceptions in a round are raised."""
+
+    def __init__(self, rounds: List[list]) -> None:
+        self.rounds = list(rounds)
+        self.calls = 0
+
+    async def astream(self, messages, tools, cancel_token=None):
+        cancel_token = cancel_token or CancellationToken()
+        self.calls += 1
+        async for chunk in cancel_token.iterate(self._chunks(self.rounds.pop(0))):
+            yield chunk
+
+    async def _chunks(self, round_items):
+        for item in round_items:
+            if item is HANG:
+                await asyncio.sleep(3600)
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+@pytest.fixture
+def scripted_llm():
+    return ScriptedLLM
+
+
+@pytest.fixture
+def hang():
+    return HANG
+
+
+@pytest.fixture
+def tool_call():
+    counter = iter(range(1_000_000))
+
+    def make(name, **args):
+        return ToolCall(id=f"call-{next(counter)}", name=name, args=args)
+
+    return make
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """A sqlite database with a 20-row users table."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE users (id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT)")
+        for i in range(20):
+            connection.exec_driver_sql(f"INSERT INTO users VALUES ({i}, 'first{i}', 'last{i}')")
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def sql_agent(monkeypatch, database_url):
+    """Factory for SQL agents on `database_url` driven by a scripted LLM."""
+    from agents.builtins.agent_with_sql_tools import AgentWithSQLTools
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    agents = []
+
+    def make(rounds=(), **kwargs):
+        agent = AgentWithSQLTools(database_url, **kwargs)
+        agent._llm = ScriptedLLM(rounds)
+        agents.append(agent)
+        return agent
+
+    yield make
+    for agent in agents:
+        agent.dispose()
@@ -0,0 +1,305 @@
+import asyncio
+import time
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import event
+
+from agents.builtins.agent_with_sql_tools import QUERY_TIMEOUT_SECONDS
+from agents.core.cancellation import CancellationToken, TurnCancelledError
+from agents.core.chat_context import ChatMessage, ChatRole
+from agents.core.tool_scheduler import ToolScheduler
+from agents.core.tools import ToolError
+from sdk.client import Client
+
+
+class User(BaseModel):
+    first_name: str
+    last_name: str
+
+
+def _run_turn(agent, content="question", cancel_token=None):
+    async def run():
+        message = ChatMessage(role=ChatRole.USER, content=content)
+        return [chunk async for chunk in agent.astream(chat_message=message, cancel_token=cancel_token)]
+    return asyncio.run(run())
+
+
+def _stream(client, result_type):
+    async def run():
+        return [row async for row in client.stream("question", result_type)]
+    return asyncio.run(run())
+
+
+def _client(monkeypatch, database_url, scripted_llm, rounds):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    client = Client(database_url)
+    client._agent._llm = scripted_llm(rounds)
+    return client
+
+
+def test_stream_returns_the_rows_of_return_rows(monkeypatch, database_url, scripted_llm, tool_call):
+    query = "SELECT first_name, last_name FROM users ORDER BY id"
+    client = _client(monkeypatch, database_url, scripted_llm, [[tool_call("return_rows", query=query)], ["Done"]])
+
+    rows = _stream(client, User)
+
+    assert len(rows) == 20
+    assert rows[0] == User(first_name="first0", last_name="last0")
+    assert client._agent.engine.pool.checkedout() == 0
+
+
+def test_exploratory_reads_return_full_results_during_passthrough(monkeypatch, database_url, scripted_llm, tool_call):
+    explore = tool_call("execute_query", query="SELECT DISTINCT last_name FROM users")
+    final = tool_call("return_rows", query="SELECT first_name, last_name FROM users WHERE id < 2")
+    client = _client(monkeypatch, database_url, scripted_llm, [[explore], [final], ["Done"]])
+
+    rows = _stream(client, User)
+
+    assert [row.first_name for row in rows] == ["first0", "first1"]
+    assert "last19" in explore.response
+    assert "delivered directly to the caller" not in explore.response
+
+
+def test_last_issued_return_rows_wins(monkeypatch, database_url, scripted_llm, tool_call):
+    # The first query is slower, so it finishes last
+    slow = (
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000) "
+        "SELECT 'slow' AS first_name, 'slow' AS last_name FROM c WHERE x = 300000"
+    )
+    fast = "SELECT first_name, last_name FROM users WHERE id = 3"
+    client = _client(monkeypatch, database_url, scripted_llm, [
+        [tool_call("return_rows", query=slow), tool_call("return_rows", query=fast)],
+        ["Done"],
+    ])
+
+    assert _stream(client, User) == [User(first_name="first3", last_name="last3")]
+
+
+def test_return_rows_requires_a_waiting_caller(sql_agent, tool_call):
+    call = tool_call("return_rows", query="SELECT * FROM users")
+    agent = sql_agent([[call], ["Done"]])
+
+    _run_turn(agent)
+
+    assert call.response.startswith("Error: No caller is waiting for rows")
+
+
+def test_failed_final_query_does_not_fall_back_to_an_earlier_result(monkeypatch, database_url, scripted_llm, tool_call):
+    client = _client(monkeypatch, database_url, scripted_llm, [
+        [tool_call("return_rows", query="SELECT first_name, last_name FROM users")],
+        [tool_call("return_rows", query="SELECT nope FROM users")],
+        ["Done"],
+    ])
+
+    with pytest.raises(ValueError, match="The final query failed"):
+        _stream(client, User)
+    assert client._agent.engine.pool.checkedout() == 0
+
+
+def test_failed_exploratory_query_keeps_the_final_result(monkeypatch, database_url, scripted_llm, tool_call):
+    client = _client(monkeypatch, database_url, scripted_llm, [
+        [tool_call("return_rows", query="SELECT first_name, last_name FROM users WHERE id = 0")],
+        [tool_call("execute_query", query="SELECT nope FROM users")],
+        ["Done"],
+    ])
+
+    assert _stream(client, User) == [User(first_name="first0", last_name="last0")]
+
+
+def _count_users(agent):
+    with agent.engine.connect() as connection:
+        return connection.exec_driver_sql("SELECT count(*) FROM users").scalar()
+
+
+def test_turn_commits_when_it_completes(sql_agent, tool_call):
+    agent = sql_agent([
+        [tool_call("execute_query", query="INSERT INTO users VALUES (100, 'a', 'b')")],
+        ["Done"],
+    ], turn_scoped_transactions=True)
+
+    _run_turn(agent)
+
+    assert _count_users(agent) == 21
+
+
+def test_turn_rolls_back_when_it_fails(sql_agent, tool_call):
+    agent = sql_agent([
+        [tool_call("execute_query", query="INSERT INTO users VALUES (100, 'a', 'b')")],
+        [tool_call("execute_query", query="INSERT INTO users VALUES (101, 'c', 'd')")],
+        [RuntimeError("model failed")],
+    ], turn_scoped_transactions=True)
+
+    with pytest.raises(RuntimeError):
+        _run_turn(agent)
+
+    assert _count_users(agent) == 20
+    assert agent._turn_connection is None
+
+
+def test_failed_statement_only_rolls_back_its_savepoint(sql_agent, tool_call):
+    failing = tool_call("execute_query", query="INSERT INTO users VALUES (0, 'duplicate', 'id')")
+    agent = sql_agent([
+        [tool_call("execute_query", query="INSERT INTO users VALUES (100, 'a', 'b')")],
+        [failing],
+        [tool_call("execute_query", query="INSERT INTO users VALUES (101, 'c', 'd')")],
+        ["Done"],
+    ], turn_scoped_transactions=True)
+
+    _run_turn(agent)
+
+    assert failing.response.startswith("Error executing query")
+    assert _count_users(agent) == 22
+
+
+def test_cancelled_turn_interrupts_the_statement_and_rolls_back(sql_agent, tool_call):
+    slow_insert = (
+        "INSERT INTO users (first_name, last_name) "
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+        "SELECT 'slow', 'insert' FROM c WHERE x = 100000000"
+    )
+    agent = sql_agent([
+        [tool_call("execute_query", query="INSERT INTO users VALUES (100, 'a', 'b')")],
+        [tool_call("execute_query", query=slow_insert)],
+    ], turn_scoped_transactions=True)
+
+    started = time.monotonic()
+    with pytest.raises(TurnCancelledError):
+        _run_turn(agent, cancel_token=CancellationToken(timeout=0.5))
+
+    assert time.monotonic() - started < 5
+    assert _count_users(agent) == 20
+    assert agent._turn_connection is None
+
+
+def test_turn_uses_one_connection(sql_agent, tool_call):
+    agent = sql_agent([
+        [tool_call("describe_table", table_name="users"), tool_call("execute_query", query="SELECT * FROM users")],
+        [tool_call("execute_query", query="SELECT count(*) FROM users"), tool_call("list_tables")],
+        ["Done"],
+    ], turn_scoped_transactions=True)
+    checkouts = []
+    event.listen(agent.engine.pool, "checkout", lambda *args: checkouts.append(args))
+
+    _run_turn(agent)
+
+    assert len(checkouts) == 1
+
+
+def test_catalog_tool_uses_one_connection_per_call(sql_agent):
+    agent = sql_agent()
+    checkouts = []
+    event.listen(agent.engine.pool, "checkout", lambda *args: checkouts.append(args))
+
+    # Building the index takes several reflection round trips
+    asyncio.run(agent.search_schema("users"))
+
+    assert len(checkouts) == 1
+
+
+def test_search_schema_sees_uncommitted_ddl_from_the_turn(sql_agent, tool_call):
+    search = tool_call("search_schema", query="invoice")
+    agent = sql_agent([
+        [tool_call("execute_query", query="CREATE TABLE invoices (id INTEGER, amount REAL)")],
+        [search],
+        [RuntimeError("model failed")],
+    ], turn_scoped_transactions=True)
+
+    with pytest.raises(RuntimeError):
+        _run_turn(agent)
+
+    assert search.response.startswith("invoices")
+    # The DDL was rolled back, and so is the index built from it
+    assert asyncio.run(agent.search_schema("invoice")) == "No tables match 'invoice'."
+
+
+def test_read_falls_back_to_the_primary_when_the_replica_is_unreachable(sql_agent, tmp_path):
+    agent = sql_agent(replica_urls=f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    response = asyncio.run(agent.execute_query("SELECT count(*) FROM users"))
+
+    assert response.endswith("20")
+
+
+def test_statement_failing_on_the_replica_is_not_retried(sql_agent, tmp_path):
+    # The replica is reachable but lacks the table, like a query the replica rejected
+    agent = sql_agent(replica_urls=f"sqlite:///{tmp_path / 'replica.db'}")
+
+    response = asyncio.run(agent.execute_query("SELECT count(*) FROM users"))
+
+    assert response.startswith("Error executing query")
+    assert "no such table" in response
+
+
+@pytest.fixture
+def agent_with_schemas(sql_agent, tmp_path):
+    agent = sql_agent()
+    logistics = tmp_path / "logistics.db"
+
+    @event.listens_for(agent.engine, "connect")
+    def attach(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{logistics}' AS logistics")
+
+    # Drop connections opened before the listener
+    agent.engine.dispose()
+    response = asyncio.run(agent.execute_query(
+        "CREATE TABLE logistics.shipping_addresses (id INTEGER PRIMARY KEY, order_id INTEGER, street TEXT)"
+    ))
+    assert response.startswith("Query executed successfully"), response
+    return agent
+
+
+def test_describe_table_reports_primary_keys(sql_agent):
+    response = asyncio.run(sql_agent().describe_table("users"))
+
+    assert "Primary Keys: id" in response
+    assert "  - first_name: TEXT" in response
+
+
+def test_search_results_can_be_described(agent_with_schemas):
+    agent = agent_with_schemas
+
+    search = asyncio.run(agent.search_schema("shipping address"))
+    by_schema = asyncio.run(agent.describe_table("shipping_addresses", schema_name="logistics"))
+    by_qualified_name = asyncio.run(agent.describe_table("logistics.shipping_addresses"))
+
+    assert search.startswith("logistics.shipping_addresses")
+    assert by_schema.startswith("Schema for table 'logistics.shipping_addresses'")
+    assert "  - street: TEXT" in by_schema
+    assert "  - street: TEXT" in by_qualified_name
+
+
+def test_search_schema_reports_errors_as_tool_errors(sql_agent, monkeypatch):
+    agent = sql_agent()
+
+    async def fail():
+        raise RuntimeError("catalog unavailable")
+
+    monkeypatch.setattr(agent, "_get_schema_index", fail)
+    with pytest.raises(ToolError, match="Error searching schema: catalog unavailable"):
+        asyncio.run(agent.search_schema("users"))
+
+
+def test_scheduler_is_forwarded_and_queries_have_a_deadline(sql_agent):
+    scheduler = ToolScheduler(max_concurrency=2)
+    agent = sql_agent(tool_scheduler=scheduler)
+
+    assert agent._tool_scheduler is scheduler
+    assert agent._tool_options["execute_query"].timeout == QUERY_TIMEOUT_SECONDS
+    assert agent._tool_options["return_rows"].timeout == QUERY_TIMEOUT_SECONDS
+
+
+def test_timed_out_query_is_interrupted_and_the_turn_continues(sql_agent, tool_call):
+    slow = tool_call("execute_query", query=(
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+        "SELECT count(*) FROM c"
+    ))
+    agent = sql_agent([[slow], ["Done"]])
+    agent._tool_options["execute_query"] = agent._tool_options["execute_query"].model_copy(update={"timeout": 0.2})
+
+    started = time.monotonic()
+    chunks = _run_turn(agent)
+
+    assert time.monotonic() - started < 5
+    assert slow.response.startswith("Error: Tool call 'execute_query' timed out")
+    assert chunks[-1] == "Done"
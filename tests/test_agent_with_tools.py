@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from agents.core.agent_with_tools import AgentWithTools
+from agents.core.cancellation import CancellationToken, TurnCancelledError
+from agents.core.chat_context import ChatMessage, ChatRole
+from agents.core.tools import tool
+
+
+class _Agent(AgentWithTools):
+    @tool(read_only=True)
+    async def lookup(self, key: str) -> str:
+        """Look something up."""
+        return f"found {key}"
+
+    @tool
+    async def wait(self) -> str:
+        """Wait for a long time."""
+        await asyncio.sleep(3600)
+        return "done"
+
+
+def _run_turn(agent, content, cancel_token=None):
+    async def run():
+        message = ChatMessage(role=ChatRole.USER, content=content)
+        return [chunk async for chunk in agent.astream(chat_message=message, cancel_token=cancel_token)]
+    return asyncio.run(run())
+
+
+def _agent(scripted_llm, rounds):
+    agent = _Agent(llm=None, instructions="system")
+    agent._llm = scripted_llm(rounds)
+    return agent
+
+
+def test_completed_turn_keeps_the_full_history(scripted_llm, tool_call):
+    call = tool_call("lookup", key="x")
+    agent = _agent(scripted_llm, [[call], ["answer"]])
+
+    chunks = _run_turn(agent, "question")
+
+    assert chunks == [call, "answer"]
+    assert call.response == "found x"
+    assert [m.content for m in agent._messages] == ["system", "question", [call], "answer"]
+
+
+def test_deadline_in_the_first_round_drops_the_request(scripted_llm, hang):
+    agent = _agent(scripted_llm, [["partial", hang]])
+
+    with pytest.raises(TurnCancelledError):
+        _run_turn(agent, "question", CancellationToken(timeout=0.05))
+
+    assert [m.content for m in agent._messages] == ["system"]
+
+
+def test_deadline_in_a_later_round_marks_the_request_interrupted(scripted_llm, tool_call, hang):
+    call = tool_call("lookup", key="x")
+    agent = _agent(scripted_llm, [[call], [hang]])
+
+    with pytest.raises(TurnCancelledError):
+        _run_turn(agent, "question", CancellationToken(timeout=0.05))
+
+    contents = [m.content for m in agent._messages]
+    assert contents[:3] == ["system", "question", [call]]
+    assert len(contents) == 4
+    assert contents[3].startswith("[Interrupted (deadline exceeded)")
+    assert agent._messages[3].role == ChatRole.ASSISTANT
+
+
+def test_cancel_during_a_tool_call_cancels_the_tool(scripted_llm, tool_call):
+    agent = _agent(scripted_llm, [[tool_call("wait")]])
+
+    async def run():
+        token = CancellationToken()
+        asyncio.get_running_loop().call_later(0.05, token.cancel)
+        message = ChatMessage(role=ChatRole.USER, content="question")
+        with pytest.raises(TurnCancelledError):
+            async for _ in agent.astream(chat_message=message, cancel_token=token):
+                pass
+        # Nothing is left running once the turn has unwound
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+    assert [m.content for m in agent._messages] == ["system"]
+
+
+def test_cancelling_the_consumer_cancels_the_token(scripted_llm, hang):
+    agent = _agent(scripted_llm, [[hang]])
+    tokens = []
+
+    async def run():
+        token = CancellationToken()
+        tokens.append(token)
+        message = ChatMessage(role=ChatRole.USER, content="question")
+
+        async def consume():
+            async for _ in agent.astream(chat_message=message, cancel_token=token):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert tokens[0].cancelled
+    assert [m.content for m in agent._messages] == ["system"]
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.core.cancellation import CALLER_CANCELLED, DEADLINE_EXCEEDED, CancellationToken, TurnCancelledError
+
+
+def test_guard_returns_the_result():
+    async def run():
+        return await CancellationToken(timeout=1).guard(asyncio.sleep(0, result="done"))
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_guard_raises_when_the_deadline_passes():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        token = CancellationToken(timeout=0.05)
+        started = time.monotonic()
+        with pytest.raises(TurnCancelledError, match=DEADLINE_EXCEEDED):
+            await token.guard(slow())
+        return token, time.monotonic() - started
+
+    token, elapsed = asyncio.run(run())
+
+    assert elapsed < 1
+    assert token.cancelled and token.reason == DEADLINE_EXCEEDED
+    assert cancelled == [True]
+
+
+def test_guard_raises_on_explicit_cancel():
+    async def run():
+        token = CancellationToken()
+        asyncio.get_running_loop().call_later(0.01, token.cancel)
+        with pytest.raises(TurnCancelledError, match=CALLER_CANCELLED):
+            await token.guard(asyncio.sleep(10))
+
+    asyncio.run(run())
+
+
+def test_guard_checks_before_awaiting():
+    async def run():
+        token = CancellationToken()
+        token.cancel("stop")
+        with pytest.raises(TurnCancelledError, match="stop"):
+            await token.guard(asyncio.sleep(0))
+
+    asyncio.run(run())
+
+
+def test_callbacks_fire_once_and_can_be_unregistered():
+    fired = []
+    token = CancellationToken()
+    token.on_cancel(lambda: fired.append("a"))
+    unregister = token.on_cancel(lambda: fired.append("b"))
+    token.on_cancel(lambda: 1 / 0)
+    unregister()
+
+    token.cancel()
+    token.cancel("again")
+
+    assert fired == ["a"]
+    assert token.reason == CALLER_CANCELLED
+
+
+def test_callback_registered_after_cancel_runs_immediately():
+    token = CancellationToken()
+    token.cancel()
+    fired = []
+
+    token.on_cancel(lambda: fired.append(True))
+
+    assert fired == [True]
+
+
+def test_deadline_fires_callbacks_on_check():
+    fired = []
+    token = CancellationToken(timeout=0)
+    token.on_cancel(lambda: fired.append(True))
+
+    with pytest.raises(TurnCancelledError):
+        token.check()
+
+    assert fired == [True]
+
+
+def test_iterate_stops_at_the_deadline():
+    async def ticks():
+        for i in range(100):
+            await asyncio.sleep(0.01)
+            yield i
+
+    async def run():
+        seen = []
+        with pytest.raises(TurnCancelledError):
+            async for tick in CancellationToken(timeout=0.1).iterate(ticks()):
+                seen.append(tick)
+        return seen
+
+    seen = asyncio.run(run())
+
+    assert 0 < len(seen) < 100
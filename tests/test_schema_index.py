@@ -0,0 +1,57 @@
+import pytest
+
+from agents.builtins.schema_index import ColumnEntry, SchemaIndex, TableEntry, tokenize
+
+
+def _table(name, columns, comment=None, schema_name=None):
+    return TableEntry(
+        schema_name=schema_name,
+        name=name,
+        comment=comment,
+        columns=[ColumnEntry(name=column, type="TEXT") for column in columns],
+    )
+
+
+TABLES = [
+    _table("users", ["id", "first_name", "last_name", "email"]),
+    _table("orders", ["id", "user_id", "total", "created_at"], comment="Customer purchases"),
+    _table("shipping_addresses", ["id", "order_id", "street", "city"], schema_name="logistics"),
+    _table("audit_log", ["id", "event", "payload"]),
+]
+
+
+@pytest.mark.parametrize("text, terms", [
+    ("shipping_addresses", ["shipping", "address"]),
+    ("orderLineItems", ["order", "line", "item"]),
+    ("HTTPRequests", ["http", "request"]),
+    ("categories status", ["category", "status"]),
+    ("", []),
+])
+def test_tokenize(text, terms):
+    assert tokenize(text) == terms
+
+
+def test_table_name_matches_rank_first():
+    index = SchemaIndex(TABLES)
+
+    results = index.search("user email")
+
+    assert results[0].name == "users"
+    # orders only matches through its user_id column
+    assert [table.name for table in results] == ["users", "orders"]
+
+
+def test_matches_comments_and_plurals():
+    index = SchemaIndex(TABLES)
+
+    assert index.search("customer purchase")[0].name == "orders"
+    assert index.search("address")[0].qualified_name == "logistics.shipping_addresses"
+
+
+def test_top_k_and_no_match():
+    index = SchemaIndex(TABLES)
+
+    assert len(index.search("id", top_k=2)) == 2
+    assert index.search("inventory") == []
+    assert index.search("") == []
+    assert SchemaIndex([]).search("users") == []
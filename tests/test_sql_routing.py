@@ -0,0 +1,111 @@
+import pytest
+
+from agents.builtins import sql_routing
+from agents.builtins.sql_routing import DEFAULT_READ_YOUR_WRITES_SECONDS, EngineRouter, is_ddl_statement, is_read_only_statement
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM users",
+    "  select id from users;",
+    "WITH recent AS (SELECT * FROM orders) SELECT * FROM recent",
+    "EXPLAIN SELECT 1",
+    "SELECT 'INSERT INTO x' AS note",
+    "SELECT 1 -- DELETE FROM users",
+    'SELECT "update" FROM t',
+])
+def test_read_only_statements(query):
+    assert is_read_only_statement(query)
+
+
+@pytest.mark.parametrize("query", [
+    "INSERT INTO users VALUES (1)",
+    "UPDATE users SET name = 'x'",
+    "DELETE FROM users",
+    "CREATE TABLE t (id int)",
+    "SELECT 1; DELETE FROM users",
+    "WITH gone AS (DELETE FROM users RETURNING *) SELECT * FROM gone",
+    "SELECT * INTO backup FROM users",
+    "SELECT * FROM users FOR UPDATE",
+    "SELECT * FROM users FOR SHARE",
+    "SELECT nextval('users_id_seq')",
+    "",
+])
+def test_writes_are_not_read_only(query):
+    assert not is_read_only_statement(query)
+
+
+@pytest.mark.parametrize("query", [
+    "CREATE TABLE t (id int)",
+    "alter table t add column name text",
+    "DROP INDEX idx",
+    "TRUNCATE users",
+    "INSERT INTO t VALUES (1); DROP TABLE t",
+])
+def test_ddl_statements(query):
+    assert is_ddl_statement(query)
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM users",
+    "INSERT INTO log VALUES ('DROP TABLE users')",
+    "SELECT 1 /* CREATE TABLE t */",
+    "UPDATE t SET created = now()",
+])
+def test_non_ddl_statements(query):
+    assert not is_ddl_statement(query)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sql_routing.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _router(**kwargs):
+    # Engines connect lazily, so nothing is opened here
+    return EngineRouter("sqlite:///primary.db", replica_urls=["sqlite:///a.db", "sqlite:///b.db"], **kwargs)
+
+
+def test_reads_go_round_robin_to_replicas_and_writes_to_the_primary():
+    router = _router()
+    a, b = router.replicas
+
+    assert [router.engine_for("SELECT 1") for _ in range(3)] == [a, b, a]
+    assert router.engine_for("DELETE FROM users") is router.primary
+    assert router.engine_for("CREATE TABLE t (id int)") is router.primary
+
+
+def test_without_replicas_everything_goes_to_the_primary():
+    router = EngineRouter("sqlite:///primary.db")
+
+    assert router.engine_for("SELECT 1") is router.primary
+
+
+def test_reads_stick_to_the_primary_for_a_while_after_a_write(clock):
+    router = _router()
+
+    router.record_write()
+    assert router.engine_for("SELECT 1") is router.primary
+    clock[0] += DEFAULT_READ_YOUR_WRITES_SECONDS - 0.1
+    assert router.engine_for("SELECT 1") is router.primary
+    clock[0] += 0.2
+    assert router.engine_for("SELECT 1") in router.replicas
+
+
+def test_a_further_write_extends_the_stickiness(clock):
+    router = _router(read_your_writes_seconds=10)
+
+    router.record_write()
+    clock[0] += 8
+    router.record_write()
+    clock[0] += 8
+    assert router.engine_for("SELECT 1") is router.primary
+
+
+def test_stickiness_can_last_for_the_session(clock):
+    router = _router(read_your_writes_seconds=None)
+
+    router.record_write()
+    clock[0] += 1_000_000
+    assert router.engine_for("SELECT 1") is router.primary
@@ -0,0 +1,94 @@
+import asyncio
+
+from agents.core import tool_cache
+from agents.core.agent_with_tools import AgentWithTools
+from agents.core.tool_cache import ToolCache
+from agents.core.tools import ToolCall, ToolError, tool
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss():
+    cache = ToolCache(max_entries=2)
+
+    assert cache.get("a") == (False, None)
+    cache.set("a", "value")
+    assert cache.get("a") == (True, "value")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(tool_cache.time, "monotonic", clock)
+    cache = ToolCache(max_entries=2, ttl=10)
+
+    cache.set("a", "value")
+    clock.now += 10
+    assert cache.get("a") == (True, "value")
+    clock.now += 0.5
+    assert cache.get("a") == (False, None)
+    assert cache.stats().size == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ToolCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.stats().evictions == 1
+
+
+def test_invalidate():
+    cache = ToolCache(max_entries=4)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (True, 2)
+
+    cache.invalidate()
+    assert cache.stats().size == 0
+
+
+class _Agent(AgentWithTools):
+    def __init__(self):
+        super().__init__(llm=None, instructions="")
+        self.calls = 0
+
+    @tool(cache=True)
+    async def lookup(self, name: str) -> str:
+        """Look something up."""
+        self.calls += 1
+        if self.calls == 1:
+            raise ToolError("Error: lookup failed")
+        return f"found {name}"
+
+
+def test_agent_caches_responses_but_not_errors():
+    agent = _Agent()
+
+    async def call():
+        return await agent._execute_tool_call(ToolCall(id="1", name="lookup", args={"name": "x"}))
+
+    assert asyncio.run(call()) == "Error: lookup failed"
+    assert asyncio.run(call()) == "found x"
+    assert asyncio.run(call()) == "found x"
+    assert agent.calls == 2
+
+    agent.invalidate_tool_cache("lookup", {"name": "x"})
+    asyncio.run(call())
+    assert agent.calls == 3
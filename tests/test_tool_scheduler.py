@@ -0,0 +1,126 @@
+import asyncio
+
+from agents.core.tool_scheduler import ToolScheduler
+from agents.core.tools import ToolCall, ToolOptions
+
+
+def _call(name, **args):
+    return ToolCall(id=name, name=name, args=args)
+
+
+def _is_read(tool_call):
+    return tool_call.name.startswith("read")
+
+
+def _run(scheduler, tool_calls, execute, options=None):
+    return asyncio.run(scheduler.run(tool_calls, execute=execute, options=options or {}, is_read_only=_is_read))
+
+
+def test_reads_run_in_parallel_and_writes_are_barriers():
+    events = []
+
+    async def execute(tool_call):
+        events.append(("start", tool_call.name))
+        await asyncio.sleep(0.01)
+        events.append(("end", tool_call.name))
+        return tool_call.name.upper()
+
+    calls = [_call("read_a"), _call("read_b"), _call("write"), _call("read_c")]
+    responses = _run(ToolScheduler(), calls, execute)
+
+    assert responses == ["READ_A", "READ_B", "WRITE", "READ_C"]
+    assert events[:2] == [("start", "read_a"), ("start", "read_b")]
+    assert events.index(("start", "write")) > max(events.index(("end", "read_a")), events.index(("end", "read_b")))
+    assert events.index(("start", "read_c")) > events.index(("end", "write"))
+
+
+def test_identical_reads_are_executed_once():
+    executed = []
+
+    async def execute(tool_call):
+        executed.append(tool_call.args)
+        return f"rows for {tool_call.args['query']}"
+
+    calls = [_call("read", query="a"), _call("read", query="b"), _call("read", query="a")]
+    responses = _run(ToolScheduler(), calls, execute)
+
+    assert responses == ["rows for a", "rows for b", "rows for a"]
+    assert executed == [{"query": "a"}, {"query": "b"}]
+
+
+def test_identical_writes_are_not_deduplicated():
+    executed = []
+
+    async def execute(tool_call):
+        executed.append(tool_call.name)
+        return "ok"
+
+    _run(ToolScheduler(), [_call("write", query="x"), _call("write", query="x")], execute)
+
+    assert executed == ["write", "write"]
+
+
+def test_timed_out_read_reports_an_error():
+    async def execute(tool_call):
+        await asyncio.sleep(1)
+        return "late"
+
+    [response] = _run(ToolScheduler(default_timeout=0.01), [_call("read")], execute)
+
+    assert response == "Error: Tool call 'read' timed out after 0.01 seconds"
+
+
+def test_timed_out_write_is_waited_for_and_reported_as_unknown():
+    events = []
+
+    async def execute(tool_call):
+        events.append(("start", tool_call.name))
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            # Simulates a tool rolling back its statement before it gives up
+            await asyncio.sleep(0.02)
+            events.append(("cleaned up", tool_call.name))
+            raise
+        return "done"
+
+    calls = [_call("write_a"), _call("write_b")]
+    responses = _run(ToolScheduler(default_timeout=0.01), calls, execute)
+
+    assert all("may or may not have taken effect" in response for response in responses)
+    assert not any(response.startswith("Error") for response in responses)
+    assert events == [
+        ("start", "write_a"), ("cleaned up", "write_a"),
+        ("start", "write_b"), ("cleaned up", "write_b"),
+    ]
+
+
+def test_tool_timeout_overrides_the_default():
+    async def execute(tool_call):
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    options = {"read_slow": ToolOptions(timeout=1)}
+    responses = _run(ToolScheduler(default_timeout=0.01), [_call("read_slow"), _call("read_fast")], execute, options)
+
+    assert responses[0] == "ok"
+    assert "timed out" in responses[1]
+
+
+def test_tool_concurrency_limit():
+    running = 0
+    peak = 0
+
+    async def execute(tool_call):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    options = {"read": ToolOptions(max_concurrency=2)}
+    calls = [_call("read", query=str(i)) for i in range(5)]
+    _run(ToolScheduler(), calls, execute, options)
+
+    assert peak == 2